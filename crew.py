@@ -2,10 +2,11 @@ import json
 import asyncio
 import time
 from datetime import datetime
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass, asdict
-from geopy.distance import geodesic
+from typing import Dict, List, Optional, Any, Tuple
+from dataclasses import dataclass, asdict, fields
+from functools import lru_cache
 import numpy as np
+import orjson
 import pandas as pd
 
 from crewai import Agent, Task, Crew, Process, LLM
@@ -15,10 +16,18 @@ from pydantic import BaseModel, Field
 import os
 from dotenv import load_dotenv
 
+from routing import cached_distance_matrix, distance_matrix, segment_tour, tour_length
+
 load_dotenv()
 
+AVERAGE_SPEED_MPH = 45
+LOW_STOCK_THRESHOLD = 50
+CRITICAL_STOCK_THRESHOLD = 20
+LLM_MAX_CONCURRENCY = int(os.environ.get("LLM_CONCURRENCY", "2"))  # below the three crews, so it caps concurrent Gemini calls
+
+@lru_cache(maxsize=1)
 def get_llm():
-    """Get configured LLM instance"""
+    """Get configured LLM instance, shared by all agents"""
     gemini_api_key = os.environ.get("GEMINI_API_KEY") 
     
     return LLM(
@@ -26,6 +35,19 @@ def get_llm():
         api_key=gemini_api_key
     )
 
+@lru_cache(maxsize=1)
+def get_openai_client():
+    """Get the shared AsyncOpenAI client so direct OpenAI calls reuse pooled connections"""
+    # Imported on first use; the crew's agents talk to Gemini through CrewAI's LLM instead
+    import httpx
+    from openai import AsyncOpenAI
+    
+    return AsyncOpenAI(
+        http_client=httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=32, max_keepalive_connections=16)
+        )
+    )
+
 #def get_llm():
 #    """Get configured LLM instance"""
 #    openai_api_key = os.environ.get("OPENAI_API_KEY") 
@@ -86,6 +108,57 @@ class OptimizedRoute:
     priority: str
     truck_id: Optional[str] = None
 
+def _format_duration(hours: float) -> str:
+    """Format fractional hours as e.g. '4h 30m'"""
+    return f"{int(hours)}h {int((hours % 1) * 60)}m"
+
+def _shallow_asdict(obj) -> Dict:
+    """Like dataclasses.asdict, but copies dict/list fields one level instead of deep-copying"""
+    result = {}
+    for field in fields(obj):
+        value = getattr(obj, field.name)
+        if isinstance(value, dict):
+            value = dict(value)
+        elif isinstance(value, list):
+            value = list(value)
+        result[field.name] = value
+    return result
+
+def _compact_warehouse(w: Warehouse, products: Optional[List[str]] = None) -> Dict:
+    """Prompt-sized warehouse view, optionally limited to the given products' stock"""
+    stock = w.inventory if products is None else {p: w.inventory.get(p, 0) for p in products}
+    return {"id": w.id, "name": w.name, "lat": w.lat, "lng": w.lng, "stock": stock}
+
+def _compact_truck(t: Truck) -> Dict:
+    """Prompt-sized truck view without route history or running totals"""
+    return {"id": t.id, "driver": t.driver, "capacity": t.capacity, "current_load": t.current_load,
+            "lat": t.lat, "lng": t.lng, "status": t.status, "efficiency": t.efficiency}
+
+def _to_prompt_json(data: Any) -> str:
+    """Compact JSON for embedding in task descriptions"""
+    return orjson.dumps(data).decode()
+
+def _build_stock_matrix(inventories: List[Dict[str, int]]) -> Tuple[List[str], np.ndarray, np.ndarray]:
+    """Pack inventory dicts into product names, an (N_warehouses, N_products) int32 matrix,
+    and a same-shaped mask of which warehouses carry each product"""
+    products = list(dict.fromkeys(product for inventory in inventories for product in inventory))
+    product_idx = {product: j for j, product in enumerate(products)}
+    stock = np.zeros((len(inventories), len(products)), dtype=np.int32)
+    carried = np.zeros(stock.shape, dtype=np.bool_)
+    for i, inventory in enumerate(inventories):
+        for product, quantity in inventory.items():
+            j = product_idx[product]
+            stock[i, j] = quantity
+            carried[i, j] = True
+    return products, stock, carried
+
+def _analyze_stock(stock: np.ndarray, carried: np.ndarray, low_threshold: int,
+                   critical_threshold: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Low/critical stock masks and per-warehouse low item counts over the carried products"""
+    low = carried & (stock < low_threshold)
+    critical = low & (stock < critical_threshold)
+    return low, critical, low.sum(axis=1)
+
 # Enhanced Tools for CrewAI
 class RouteOptimizationTool(BaseTool):
     name: str = "route_optimization"
@@ -94,40 +167,53 @@ class RouteOptimizationTool(BaseTool):
     def _run(self, warehouses: List[Dict], deliveries: List[Dict], truck_capacity: int) -> Dict:
         """Optimize routes using advanced algorithms"""
         try:
-            # Convert to proper format
-            route_waypoints = []
+            # Read each stop's fields once into parallel lists; warehouses come first as pickups
+            stops = warehouses + deliveries
+            n_pickups = len(warehouses)
+            lats, lngs, names = [], [], []
+            for stop in stops:
+                lats.append(stop['lat'])
+                lngs.append(stop['lng'])
+                names.append(stop['name'])
+            
+            # Matrices are memoized per stop set since warehouse and store coordinates rarely change
+            coords_key = tuple(zip(lats, lngs))
+            distances = cached_distance_matrix(coords_key)
             
-            # Add warehouse pickup points
-            for warehouse in warehouses:
-                route_waypoints.append(RouteWaypoint(
-                    lat=warehouse['lat'],
-                    lng=warehouse['lng'],
-                    type='pickup',
-                    name=warehouse['name'],
-                    action=f"Pickup inventory from {warehouse['name']}"
-                ))
+            # Collect every pickup before any delivery: order the pickups from the origin, then the
+            # deliveries from the last pickup, each with a nearest-neighbor seed refined by 2-opt
+            pickups = segment_tour(distances, np.arange(n_pickups))
+            delivery_indices = np.arange(n_pickups, len(stops))
+            if len(pickups):
+                deliveries_order = segment_tour(distances, np.concatenate((pickups[-1:], delivery_indices)))[1:]
+            else:
+                deliveries_order = segment_tour(distances, delivery_indices)
+            tour = np.concatenate((pickups, deliveries_order))
             
-            # Add delivery points
-            for delivery in deliveries:
-                route_waypoints.append(RouteWaypoint(
-                    lat=delivery['lat'],
-                    lng=delivery['lng'],
-                    type='delivery',
-                    name=delivery['name'],
-                    action=f"Deliver {delivery.get('quantity', 'items')} to {delivery['name']}"
-                ))
+            route_waypoints = []
+            for i in tour.tolist():
+                if i < n_pickups:
+                    route_waypoints.append(RouteWaypoint(
+                        lat=lats[i],
+                        lng=lngs[i],
+                        type='pickup',
+                        name=names[i],
+                        action=f"Pickup inventory from {names[i]}"
+                    ))
+                else:
+                    route_waypoints.append(RouteWaypoint(
+                        lat=lats[i],
+                        lng=lngs[i],
+                        type='delivery',
+                        name=names[i],
+                        action=f"Deliver {stops[i].get('quantity', 'items')} to {names[i]}"
+                    ))
             
             # Calculate total distance
-            total_distance = 0
-            for i in range(len(route_waypoints) - 1):
-                curr = route_waypoints[i]
-                next_wp = route_waypoints[i + 1]
-                distance = geodesic((curr.lat, curr.lng), (next_wp.lat, next_wp.lng)).miles
-                total_distance += distance
+            total_distance = tour_length(distances, tour)
             
             # Estimate time (assuming average speed of 45 mph)
-            estimated_hours = total_distance / 45
-            estimated_time = f"{int(estimated_hours)}h {int((estimated_hours % 1) * 60)}m"
+            estimated_time = _format_duration(total_distance / AVERAGE_SPEED_MPH)
             
             # Calculate efficiency based on distance optimization
             efficiency = max(85, min(99, 100 - (total_distance / 10)))
@@ -161,46 +247,46 @@ class InventoryAnalysisTool(BaseTool):
     def _run(self, warehouses: List[Dict], demand_history: Dict) -> Dict:
         """Analyze inventory and predict needs"""
         try:
-            analysis_results = []
-            restock_recommendations = []
-            
-            for warehouse in warehouses:
-                inventory = warehouse.get('inventory', {})
-                warehouse_analysis = {
-                    "warehouse_id": warehouse['id'],
-                    "name": warehouse['name'],
-                    "current_stock": inventory,
-                    "status": "normal"
-                }
-                
-                # Check for low stock items
-                low_stock_items = []
-                for product, quantity in inventory.items():
-                    if quantity < 50:  # Threshold for low stock
-                        low_stock_items.append(product)
-                        restock_recommendations.append({
-                            "warehouse": warehouse['name'],
-                            "product": product,
-                            "current_stock": quantity,
-                            "recommended_restock": 200,
-                            "priority": "high" if quantity < 20 else "medium"
-                        })
-                
-                if low_stock_items:
-                    warehouse_analysis["status"] = "needs_restock"
-                    warehouse_analysis["low_stock_items"] = low_stock_items
-                
-                analysis_results.append(warehouse_analysis)
-            
-            return {
-                "success": True,
-                "warehouse_analysis": analysis_results,
-                "restock_recommendations": restock_recommendations,
-                "total_warehouses_analyzed": len(warehouses),
-                "warehouses_needing_restock": len([w for w in analysis_results if w["status"] == "needs_restock"])
-            }
+            return self._analyze(warehouses, *_build_stock_matrix([w.get('inventory', {}) for w in warehouses]))
         except Exception as e:
             return {"success": False, "error": str(e)}
+    
+    def _analyze(self, warehouses: List[Dict], products: List[str], stock_matrix: np.ndarray,
+                 carried: np.ndarray) -> Dict:
+        """Restock analysis over a prebuilt stock matrix and carried-product mask"""
+        low_mask, critical_mask, low_counts = _analyze_stock(stock_matrix, carried, LOW_STOCK_THRESHOLD, CRITICAL_STOCK_THRESHOLD)
+        priorities = np.where(critical_mask, "high", "medium")
+        
+        analysis_results = [
+            {
+                "warehouse_id": warehouse['id'],
+                "name": warehouse['name'],
+                "current_stock": warehouse.get('inventory', {}),
+                "status": "normal"
+            }
+            for warehouse in warehouses
+        ]
+        restock_recommendations = []
+        
+        for i, j in np.argwhere(low_mask):
+            warehouse_analysis = analysis_results[i]
+            warehouse_analysis["status"] = "needs_restock"
+            warehouse_analysis.setdefault("low_stock_items", []).append(products[j])
+            restock_recommendations.append({
+                "warehouse": warehouses[i]['name'],
+                "product": products[j],
+                "current_stock": int(stock_matrix[i, j]),
+                "recommended_restock": 200,
+                "priority": str(priorities[i, j])
+            })
+        
+        return {
+            "success": True,
+            "warehouse_analysis": analysis_results,
+            "restock_recommendations": restock_recommendations,
+            "total_warehouses_analyzed": len(warehouses),
+            "warehouses_needing_restock": int((low_counts > 0).sum())
+        }
 
 class DemandForecastingTool(BaseTool):
     name: str = "demand_forecasting"
@@ -209,27 +295,29 @@ class DemandForecastingTool(BaseTool):
     def _run(self, historical_data: Dict, region: str, time_horizon: int = 7) -> Dict:
         """Forecast demand for specified region and time horizon"""
         try:
-            forecasts = {}
-            
-            for product, history in historical_data.items():
-                if len(history) >= 3:
-                    # Simple moving average forecast
-                    recent_avg = sum(history[-3:]) / 3
-                    trend = (history[-1] - history[-3]) / 2 if len(history) >= 3 else 0
-                    forecast = max(0, recent_avg + trend)
-                    
-                    forecasts[product] = {
-                        "predicted_demand": round(forecast),
+            # Only the last three points feed the moving average, so ragged histories stack cleanly
+            products = [product for product, history in historical_data.items() if len(history) >= 3]
+            vectorized = {}
+            if products:
+                recent = np.array([historical_data[product][-3:] for product in products], dtype=np.float64)
+                recent_avg = recent.mean(axis=1)
+                trend = (recent[:, -1] - recent[:, 0]) / 2
+                forecast = np.round(np.maximum(0, recent_avg + trend)).astype(int)
+                for product, predicted, product_trend in zip(products, forecast.tolist(), trend.tolist()):
+                    vectorized[product] = {
+                        "predicted_demand": predicted,
                         "confidence": 0.85,
-                        "trend": "increasing" if trend > 0 else "decreasing" if trend < 0 else "stable"
-                    }
-                else:
-                    forecasts[product] = {
-                        "predicted_demand": history[-1] if history else 0,
-                        "confidence": 0.5,
-                        "trend": "insufficient_data"
+                        "trend": "increasing" if product_trend > 0 else "decreasing" if product_trend < 0 else "stable"
                     }
             
+            forecasts = {}
+            for product, history in historical_data.items():
+                forecasts[product] = vectorized.get(product) or {
+                    "predicted_demand": history[-1] if history else 0,
+                    "confidence": 0.5,
+                    "trend": "insufficient_data"
+                }
+            
             return {
                 "success": True,
                 "region": region,
@@ -248,16 +336,15 @@ class TruckDispatchTool(BaseTool):
         """Dispatch the best available truck for a route"""
         try:
             available_trucks = [t for t in trucks if t.get('status') == 'idle']
+            best_truck = max(available_trucks, key=lambda t: t.get('efficiency', 0), default=None)    # select best truck via efficiency
             
-            if not available_trucks:
+            if best_truck is None:
                 return {
                     "success": False,
                     "error": "No available trucks for dispatch",
                     "recommendation": "Wait for trucks to complete current routes"
                 }
             
-            best_truck = max(available_trucks, key=lambda t: t.get('efficiency', 0))    # select best truck via efficiency
-            
             # Update truck status
             best_truck['status'] = 'en-route'
             best_truck['route'] = route.get('waypoints', [])
@@ -326,8 +413,21 @@ def create_demand_analyst_agent() -> Agent:
 # Main Multi-Agent System
 class WalmartSupplyChainCrew:
     def __init__(self):
+        # Running fleet/inventory totals, kept current by the mutation helpers below
+        self._agg: Dict[str, float] = {}
         self.warehouses = self._initialize_warehouses()
+        self._wh_index = {w.id: i for i, w in enumerate(self.warehouses)}
+        self._warehouse_by_id = {w.id: w for w in self.warehouses}
+        self._wh_coords = np.ascontiguousarray([[w.lat, w.lng] for w in self.warehouses], dtype=np.float32)
+        self._wh_distance_matrix = distance_matrix(self._wh_coords)
+        self._wh_cache: Optional[List[Dict]] = None
+        self._truck_cache: Optional[List[Dict]] = None
+        self._refresh_stock()
         self.trucks = self._initialize_trucks()
+        self._truck_by_id = {t.id: t for t in self.trucks}
+        # Efficiency is static per truck, so dispatch order never needs re-sorting
+        self._truck_eff_order = sorted(range(len(self.trucks)), key=lambda i: -self.trucks[i].efficiency)
+        self._rebuild_aggregates()
         self.demand_history = self._initialize_demand_history()
         self.performance_metrics = {
             "total_distance_saved": 0,
@@ -347,6 +447,47 @@ class WalmartSupplyChainCrew:
             process=Process.sequential,
             verbose=True
         )
+        
+        # Single-agent crews are built once and handed one task per call
+        self._manager_crew = Crew(agents=[self.supply_chain_manager], tasks=[], process=Process.sequential, verbose=True)
+        self._logistics_crew = Crew(agents=[self.logistics_coordinator], tasks=[], process=Process.sequential, verbose=True)
+        self._analyst_crew = Crew(agents=[self.demand_analyst], tasks=[], process=Process.sequential, verbose=True)
+        
+        # Concurrent scenarios share one LLM budget; a crew only works one task at a time
+        self._llm_semaphore = asyncio.Semaphore(LLM_MAX_CONCURRENCY)
+        self._crew_locks = {
+            id(crew): asyncio.Lock()
+            for crew in (self._manager_crew, self._logistics_crew, self._analyst_crew)
+        }
+        self._llm_queued = 0
+        self._llm_in_flight = 0
+        
+        # State changes published for real-time subscribers (e.g. the API server's broadcaster)
+        self.update_queue: asyncio.Queue = asyncio.Queue()
+        
+        # Open the LLM connection before the first real request needs it (set LLM_WARMUP=0 to skip);
+        # only possible on a running loop, since the call takes an LLM slot like any other
+        self._warmup_task = None
+        if os.environ.get("LLM_WARMUP", "1") != "0":
+            try:
+                self._warmup_task = asyncio.get_running_loop().create_task(self._warm())
+            except RuntimeError:
+                pass
+    
+    def _warm_sync(self):
+        """Send a one-word prompt so client setup and the TLS handshake happen up front"""
+        try:
+            get_llm().call("ok")
+        except Exception:
+            pass  # best effort; a real request will surface any LLM error
+    
+    async def _warm(self):
+        # Let calls started alongside construction register first; any real call opens the connection anyway
+        await asyncio.sleep(0)
+        if self._llm_queued or self._llm_in_flight:
+            return
+        async with self._llm_semaphore:
+            await asyncio.to_thread(self._warm_sync)
     
     def _initialize_warehouses(self) -> List[Warehouse]:
         """Initialize warehouse data"""
@@ -395,16 +536,127 @@ class WalmartSupplyChainCrew:
             }
         }
     
-    def analyze_supply_chain_status(self) -> Dict:
+    def _refresh_stock(self):
+        """Rebuild the stock matrix from warehouse inventories; call after inventory changes"""
+        self._products, self._stock, _ = _build_stock_matrix([w.inventory for w in self.warehouses])
+        self._product_idx = {product: j for j, product in enumerate(self._products)}
+        self._agg["total_inventory"] = int(self._stock.sum())
+        self._wh_cache = None
+    
+    def _rebuild_aggregates(self):
+        """Recompute every running total from scratch"""
+        # One pass per collection instead of a generator per total
+        total_fuel_saved = total_co2_reduced = efficiency_sum = 0.0
+        active_trucks = 0
+        for t in self.trucks:
+            total_fuel_saved += t.fuel_saved
+            total_co2_reduced += t.co2_reduced
+            efficiency_sum += t.efficiency
+            if t.status != 'idle':
+                active_trucks += 1
+        total_capacity = 0
+        for w in self.warehouses:
+            total_capacity += w.capacity
+        self._agg.update({
+            "total_fuel_saved": total_fuel_saved,
+            "total_co2_reduced": total_co2_reduced,
+            "active_trucks": active_trucks,
+            "efficiency_sum": efficiency_sum,
+            "total_inventory": int(self._stock.sum()),
+            "total_capacity": total_capacity
+        })
+    
+    def apply_fuel_saved(self, truck: Truck, delta: float):
+        """Add to a truck's fuel savings and the fleet total"""
+        truck.fuel_saved += delta
+        self._agg["total_fuel_saved"] += delta
+        self._truck_cache = None
+    
+    def apply_co2_reduced(self, truck: Truck, delta: float):
+        """Add to a truck's CO2 reduction and the fleet total"""
+        truck.co2_reduced += delta
+        self._agg["total_co2_reduced"] += delta
+        self._truck_cache = None
+    
+    def set_truck_status(self, truck: Truck, status: str):
+        """Change a truck's status, keeping the active-truck count in step"""
+        was_active = truck.status != 'idle'
+        truck.status = status
+        self._agg["active_trucks"] += (status != 'idle') - was_active
+        self._truck_cache = None
+    
+    def invalidate_cache(self, warehouses: bool = True, trucks: bool = True):
+        """Drop cached warehouse/truck dicts; call after mutating warehouses or trucks"""
+        if warehouses:
+            self._wh_cache = None
+        if trucks:
+            self._truck_cache = None
+    
+    def _warehouse_dicts(self) -> List[Dict]:
+        """Serialized warehouses, cached until invalidate_cache(); treat as read-only"""
+        if self._wh_cache is None:
+            self._wh_cache = [_shallow_asdict(w) for w in self.warehouses]
+        return self._wh_cache
+    
+    def _truck_dicts(self) -> List[Dict]:
+        """Serialized trucks, cached until invalidate_cache(); treat as read-only"""
+        if self._truck_cache is None:
+            self._truck_cache = [_shallow_asdict(t) for t in self.trucks]
+        return self._truck_cache
+    
+    def _next_idle_truck(self) -> Optional[Truck]:
+        """Most efficient truck that is currently idle"""
+        return next((self.trucks[i] for i in self._truck_eff_order if self.trucks[i].status == 'idle'), None)
+    
+    def _nearest_warehouses_with(self, warehouse_id: int, product: str, min_quantity: int = 100,
+                                 limit: int = 3) -> List[Tuple[Warehouse, float]]:
+        """Closest other warehouses holding more than min_quantity of a product, nearest first"""
+        if product not in self._product_idx:
+            return []
+        idx = self._wh_index[warehouse_id]
+        candidates = np.flatnonzero(self._stock[:, self._product_idx[product]] > min_quantity)
+        candidates = candidates[candidates != idx]
+        distances = self._wh_distance_matrix[idx]
+        nearest = candidates[np.argsort(distances[candidates], kind="stable")][:limit]
+        return [(self.warehouses[j], float(distances[j])) for j in nearest]
+    
+    async def _kickoff(self, crew: Crew, task: Task) -> Any:
+        """Run a task on a prebuilt crew off the event loop, bounded by the crew lock and LLM semaphore"""
+        # Queued covers both waits, so requests stuck behind a busy crew show up in the metrics
+        queued = True
+        self._llm_queued += 1
+        try:
+            async with self._crew_locks[id(crew)], self._llm_semaphore:
+                queued = False
+                self._llm_queued -= 1
+                self._llm_in_flight += 1
+                try:
+                    crew.tasks = [task]
+                    return await crew.kickoff_async()
+                finally:
+                    self._llm_in_flight -= 1
+        finally:
+            if queued:
+                self._llm_queued -= 1
+    
+    def get_llm_load(self) -> Dict[str, int]:
+        """Free LLM slots and the number of calls still waiting for a crew or a slot"""
+        return {
+            "llm_slots_free": LLM_MAX_CONCURRENCY - self._llm_in_flight,
+            "llm_queue_depth": self._llm_queued
+        }
+    
+    async def analyze_supply_chain_status(self) -> Dict:
         """Analyze current supply chain status using AI agents"""
+        now = datetime.now()
         
         # Create comprehensive analysis task
         analysis_task = Task(
             description=f"""
             Analyze the current supply chain status including:
-            1. Warehouse inventory levels: {[asdict(w) for w in self.warehouses]}
-            2. Truck fleet status: {[asdict(t) for t in self.trucks]}
-            3. Historical demand data: {self.demand_history}
+            1. Warehouse inventory levels: {_to_prompt_json([_compact_warehouse(w) for w in self.warehouses])}
+            2. Truck fleet status: {_to_prompt_json([_compact_truck(t) for t in self.trucks])}
+            3. Historical demand data: {_to_prompt_json(self.demand_history)}
             
             Provide recommendations for:
             - Inventory rebalancing needs
@@ -418,28 +670,21 @@ class WalmartSupplyChainCrew:
             agent=self.supply_chain_manager
         )
         
-        # Create a temporary crew for this specific task
-        temp_crew = Crew(
-            agents=[self.supply_chain_manager],
-            tasks=[analysis_task],
-            process=Process.sequential,
-            verbose=True
-        )
-        
-        result = temp_crew.kickoff()
+        result = await self._kickoff(self._manager_crew, analysis_task)
         
         return {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": now.isoformat(),
             "analysis": result,
-            "warehouses": [asdict(w) for w in self.warehouses],
-            "trucks": [asdict(t) for t in self.trucks],
+            "warehouses": self._warehouse_dicts(),
+            "trucks": self._truck_dicts(),
             "performance_metrics": self.performance_metrics
         }
     
-    def optimize_route(self, origin_warehouse_id: int, destination_requests: List[Dict]) -> Dict:
+    async def optimize_route(self, origin_warehouse_id: int, destination_requests: List[Dict]) -> Dict:
         """Optimize a route using AI agents"""
+        now = datetime.now()
         
-        origin_warehouse = next((w for w in self.warehouses if w.id == origin_warehouse_id), None)
+        origin_warehouse = self._warehouse_by_id.get(origin_warehouse_id)
         if not origin_warehouse:
             return {"success": False, "error": "Origin warehouse not found"}
         
@@ -448,9 +693,9 @@ class WalmartSupplyChainCrew:
             description=f"""
             Optimize a delivery route starting from {origin_warehouse.name}:
             
-            Origin: {asdict(origin_warehouse)}
-            Delivery Requests: {destination_requests}
-            Available Trucks: {[asdict(t) for t in self.trucks if t.status == 'idle']}
+            Origin: {_to_prompt_json(_compact_warehouse(origin_warehouse))}
+            Delivery Requests: {_to_prompt_json(destination_requests)}
+            Available Trucks: {_to_prompt_json([_compact_truck(t) for t in self.trucks if t.status == 'idle'])}
             
             Requirements:
             1. Minimize total distance and fuel consumption
@@ -465,15 +710,7 @@ class WalmartSupplyChainCrew:
             agent=self.logistics_coordinator
         )
         
-        # Create a temporary crew for this specific task
-        temp_crew = Crew(
-            agents=[self.logistics_coordinator],
-            tasks=[route_task],
-            process=Process.sequential,
-            verbose=True
-        )
-        
-        result = temp_crew.kickoff()
+        result = await self._kickoff(self._logistics_crew, route_task)
         
         # Update performance metrics
         self.performance_metrics["active_routes"] += 1
@@ -482,11 +719,12 @@ class WalmartSupplyChainCrew:
         return {
             "success": True,
             "optimization_result": result,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": now.isoformat()
         }
     
-    def forecast_demand(self, region: str, days_ahead: int = 7) -> Dict:
+    async def forecast_demand(self, region: str, days_ahead: int = 7) -> Dict:
         """Forecast demand for a specific region"""
+        now = datetime.now()
         
         if region not in self.demand_history:
             return {"success": False, "error": f"No historical data for region: {region}"}
@@ -495,9 +733,9 @@ class WalmartSupplyChainCrew:
             description=f"""
             Forecast demand for region: {region}
             
-            Historical Data: {self.demand_history[region]}
+            Historical Data: {_to_prompt_json(self.demand_history[region])}
             Forecast Horizon: {days_ahead} days
-            Current Season: {datetime.now().strftime("%B")}
+            Current Season: {now.strftime("%B")}
             
             Consider:
             1. Historical trends and seasonality
@@ -511,31 +749,51 @@ class WalmartSupplyChainCrew:
             agent=self.demand_analyst
         )
         
-        # Create a temporary crew for this specific task
-        temp_crew = Crew(
-            agents=[self.demand_analyst],
-            tasks=[forecast_task],
-            process=Process.sequential,
-            verbose=True
-        )
-        
-        result = temp_crew.kickoff()
+        result = await self._kickoff(self._analyst_crew, forecast_task)
         
         return {
             "success": True,
             "region": region,
             "forecast_horizon": days_ahead,
             "forecast_result": result,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": now.isoformat()
         }
     
-    def handle_emergency_restock(self, warehouse_id: int, product: str, critical_level: int) -> Dict:
+    async def handle_emergency_restock(self, warehouse_id: int, product: str, critical_level: int) -> Dict:
         """Handle emergency restocking situation using AI coordination"""
+        now = datetime.now()
         
-        target_warehouse = next((w for w in self.warehouses if w.id == warehouse_id), None)
+        target_warehouse = self._warehouse_by_id.get(warehouse_id)
         if not target_warehouse:
             return {"success": False, "error": "Target warehouse not found"}
         
+        # Source, distance and ETA are deterministic; the LLM only writes the action plan around them
+        sources = self._nearest_warehouses_with(warehouse_id, product)
+        nearest_source = sources[0] if sources else None
+        best_truck = self._next_idle_truck()
+        
+        facts = {
+            "source_warehouse": None,
+            "distance_miles": None,
+            "eta": None,
+            "dispatch_truck": best_truck.id if best_truck else None
+        }
+        if nearest_source:
+            source_warehouse, source_distance = nearest_source
+            facts["source_warehouse"] = source_warehouse.name
+            facts["distance_miles"] = round(source_distance, 1)
+            facts["eta"] = _format_duration(source_distance / AVERAGE_SPEED_MPH)
+            source_fact = f"Nearest source: {source_warehouse.name} (ID: {source_warehouse.id}) with {source_warehouse.inventory.get(product, 0)} units, {facts['distance_miles']} miles away"
+            eta_fact = f"ETA: {facts['eta']} at {AVERAGE_SPEED_MPH} mph"
+        else:
+            source_fact = f"Nearest source: none - no other warehouse holds more than 100 units of {product}"
+            eta_fact = "ETA: unavailable"
+        backup_sources = [
+            {**_compact_warehouse(w, [product]), "distance_miles": round(d, 1)} for w, d in sources[1:]
+        ]
+        truck_fact = (f"Dispatch truck: {best_truck.id} ({best_truck.driver}, {best_truck.efficiency}% efficiency)"
+                      if best_truck else "Dispatch truck: none idle")
+        
         emergency_task = Task(
             description=f"""
             EMERGENCY RESTOCK SITUATION:
@@ -545,15 +803,16 @@ class WalmartSupplyChainCrew:
             Critical Level: {critical_level} units remaining
             Current Inventory: {target_warehouse.inventory.get(product, 0)} units
             
-            Available Source Warehouses: {[asdict(w) for w in self.warehouses if w.id != warehouse_id and w.inventory.get(product, 0) > 100]}
-            Available Trucks: {[asdict(t) for t in self.trucks if t.status == 'idle']}
+            FACTS (already computed, do not recalculate):
+            - {source_fact}
+            - {eta_fact}
+            - {truck_fact}
+            - Backup sources: {_to_prompt_json(backup_sources)}
             
-            IMMEDIATE ACTIONS REQUIRED:
-            1. Identify nearest warehouse with sufficient {product} inventory
-            2. Calculate fastest route for emergency delivery
-            3. Dispatch most efficient available truck
-            4. Provide ETA and alternative solutions if needed
-            5. Consider customer impact and mitigation strategies
+            Write the emergency action plan around these facts:
+            1. Confirm the source warehouse, truck dispatch and ETA
+            2. Provide alternative solutions if no source or truck is available
+            3. Consider customer impact and mitigation strategies
             
             This is a high-priority emergency requiring immediate resolution.
             """,
@@ -561,47 +820,45 @@ class WalmartSupplyChainCrew:
             agent=self.supply_chain_manager
         )
         
-        # Create a temporary crew for this specific task
-        temp_crew = Crew(
-            agents=[self.supply_chain_manager],
-            tasks=[emergency_task],
-            process=Process.sequential,
-            verbose=True
-        )
-        
-        result = temp_crew.kickoff()
+        result = await self._kickoff(self._manager_crew, emergency_task)
         
         return {
             "success": True,
             "emergency_type": "critical_restock",
             "warehouse": target_warehouse.name,
             "product": product,
+            **facts,
             "action_plan": result,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": now.isoformat()
         }
     
-    def get_real_time_status(self) -> Dict:
-        """Get real-time status of the entire supply chain system"""
+    def get_real_time_status(self, timestamp: Optional[str] = None) -> Dict:
+        """Get real-time status of the entire supply chain system
+        
+        Pollers building several payloads from one clock read can pass their own timestamp.
+        """
+        if timestamp is None:
+            timestamp = datetime.now().isoformat()
         
-        # Calculate dynamic metrics
-        total_inventory = sum(sum(w.inventory.values()) for w in self.warehouses)
-        active_trucks = len([t for t in self.trucks if t.status != 'idle'])
-        avg_efficiency = sum(t.efficiency for t in self.trucks) / len(self.trucks)
+        # Dynamic metrics come from the running totals
+        total_inventory = self._agg["total_inventory"]
+        active_trucks = self._agg["active_trucks"]
+        avg_efficiency = self._agg["efficiency_sum"] / len(self.trucks)
         
         return {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": timestamp,
             "system_status": "operational",
             "warehouses": {
                 "total": len(self.warehouses),
                 "total_inventory": total_inventory,
-                "details": [asdict(w) for w in self.warehouses]
+                "details": self._warehouse_dicts()
             },
             "fleet": {
                 "total_trucks": len(self.trucks),
                 "active_trucks": active_trucks,
                 "idle_trucks": len(self.trucks) - active_trucks,
                 "average_efficiency": round(avg_efficiency, 1),
-                "details": [asdict(t) for t in self.trucks]
+                "details": self._truck_dicts()
             },
             "performance_metrics": self.performance_metrics,
             "ai_agents_status": {
@@ -624,16 +881,33 @@ async def run_walmart_supply_chain_demo():
     print(f"🤖 AI Agents: 3 (Supply Chain Manager, Logistics Coordinator, Demand Analyst)")
     print("\n" + "=" * 60)
     
+    delivery_requests = [
+        {"name": "Plano Store", "lat": 33.0198, "lng": -96.6989, "quantity": 45, "priority": "high"},
+        {"name": "Frisco Store", "lat": 33.1507, "lng": -96.8236, "quantity": 30, "priority": "medium"},
+        {"name": "McKinney Store", "lat": 33.1972, "lng": -96.6397, "quantity": 25, "priority": "high"}
+    ]
+    
+    # The scenarios are independent, so run their LLM calls concurrently and report in order
+    status_analysis, route_optimization, demand_forecast, emergency_response = await asyncio.gather(
+        supply_chain_system.analyze_supply_chain_status(),
+        supply_chain_system.optimize_route(1, delivery_requests),  # Dallas DC
+        supply_chain_system.forecast_demand("Dallas", 7),
+        supply_chain_system.handle_emergency_restock(5, "milk", 15),  # San Antonio Hub
+        return_exceptions=True
+    )
+    
     # Scenario 1: Analyze current supply chain status
     print("\n🔍 SCENARIO 1: Supply Chain Analysis")
     print("-" * 50)
     
     try:
-        status_analysis = supply_chain_system.analyze_supply_chain_status()
+        if isinstance(status_analysis, Exception):
+            raise status_analysis
         print("✅ Supply chain analysis completed!")
         print(f"📊 Analysis timestamp: {status_analysis['timestamp']}")
         print(f"🏭 Active warehouses: {len(status_analysis['warehouses'])}")
-        print(f"🚛 Fleet status: {len([t for t in status_analysis['trucks'] if t['status'] == 'idle'])} idle, {len([t for t in status_analysis['trucks'] if t['status'] != 'idle'])} active")
+        idle_trucks = sum(1 for t in status_analysis['trucks'] if t['status'] == 'idle')
+        print(f"🚛 Fleet status: {idle_trucks} idle, {len(status_analysis['trucks']) - idle_trucks} active")
         
     except Exception as e:
         print(f"❌ Error in supply chain analysis: {str(e)}")
@@ -643,13 +917,8 @@ async def run_walmart_supply_chain_demo():
     print("-" * 50)
     
     try:
-        delivery_requests = [
-            {"name": "Plano Store", "lat": 33.0198, "lng": -96.6989, "quantity": 45, "priority": "high"},
-            {"name": "Frisco Store", "lat": 33.1507, "lng": -96.8236, "quantity": 30, "priority": "medium"},
-            {"name": "McKinney Store", "lat": 33.1972, "lng": -96.6397, "quantity": 25, "priority": "high"}
-        ]
-        
-        route_optimization = supply_chain_system.optimize_route(1, delivery_requests)  # Dallas DC
+        if isinstance(route_optimization, Exception):
+            raise route_optimization
         
         if route_optimization["success"]:
             print("✅ Route optimization completed!")
@@ -666,7 +935,8 @@ async def run_walmart_supply_chain_demo():
     print("-" * 50)
     
     try:
-        demand_forecast = supply_chain_system.forecast_demand("Dallas", 7)
+        if isinstance(demand_forecast, Exception):
+            raise demand_forecast
         
         if demand_forecast["success"]:
             print("✅ Demand forecasting completed!")
@@ -684,7 +954,8 @@ async def run_walmart_supply_chain_demo():
     print("-" * 50)
     
     try:
-        emergency_response = supply_chain_system.handle_emergency_restock(5, "milk", 15)  # San Antonio Hub
+        if isinstance(emergency_response, Exception):
+            raise emergency_response
         
         if emergency_response["success"]:
             print("✅ Emergency restocking handled!")
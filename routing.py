@@ -0,0 +1,147 @@
+"""
+Route ordering kernels shared by the CrewAI tools and the basic fallback system.
+Compiled with Numba when it is installed, otherwise run on NumPy.
+"""
+
+from functools import lru_cache
+from typing import Tuple
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # Numba is optional; fall back to NumPy/pure Python kernels
+    njit = None
+
+EARTH_RADIUS_MILES = 3958.7613
+TWO_OPT_MAX_PASSES = 50  # caps 2-opt latency on large stop lists
+
+def _jit(func):
+    """Compile with Numba when available, otherwise run as plain Python"""
+    return njit(cache=True, fastmath=True)(func) if njit is not None else func
+
+@_jit
+def _unit_vectors(lats: np.ndarray, lngs: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Unit-sphere x/y/z tables for each stop, so pairwise distances need no further trig"""
+    # Work in float64 even for float32 inputs; the chord of nearby stops is a small difference
+    rlats = np.radians(lats.astype(np.float64))
+    rlngs = np.radians(lngs.astype(np.float64))
+    cos_lats = np.cos(rlats)
+    return cos_lats * np.cos(rlngs), cos_lats * np.sin(rlngs), np.sin(rlats)
+
+if njit is not None:
+    @njit(cache=True, fastmath=True)
+    def _haversine_matrix(lats: np.ndarray, lngs: np.ndarray) -> np.ndarray:
+        """Pairwise great-circle distances in miles, in the dtype of the inputs"""
+        n = lats.shape[0]
+        xs, ys, zs = _unit_vectors(lats, lngs)
+        out = np.zeros((n, n), dtype=lats.dtype)
+        for i in range(n):
+            for j in range(i + 1, n):
+                dx = xs[j] - xs[i]
+                dy = ys[j] - ys[i]
+                dz = zs[j] - zs[i]
+                half_chord = 0.5 * np.sqrt(dx * dx + dy * dy + dz * dz)
+                d = 2 * EARTH_RADIUS_MILES * np.arcsin(min(half_chord, 1.0))
+                out[i, j] = d
+                out[j, i] = d
+        return out
+
+    @njit(cache=True, fastmath=True)
+    def _nearest_neighbor(distance_matrix: np.ndarray, start: int) -> np.ndarray:
+        """Greedy tour that always moves to the closest unvisited stop"""
+        n = distance_matrix.shape[0]
+        tour = np.empty(n, dtype=np.int64)
+        visited = np.zeros(n, dtype=np.bool_)
+        tour[0] = start
+        visited[start] = True
+        for k in range(1, n):
+            current = tour[k - 1]
+            best = -1
+            best_distance = 0.0
+            for j in range(n):
+                if not visited[j] and (best < 0 or distance_matrix[current, j] < best_distance):
+                    best = j
+                    best_distance = distance_matrix[current, j]
+            tour[k] = best
+            visited[best] = True
+        return tour
+else:
+    def _haversine_matrix(lats: np.ndarray, lngs: np.ndarray) -> np.ndarray:
+        """Pairwise great-circle distances in miles, in the dtype of the inputs"""
+        points = np.stack(_unit_vectors(lats, lngs), axis=1)
+        half_chord = 0.5 * np.sqrt(((points[:, None, :] - points[None, :, :]) ** 2).sum(axis=-1))
+        return (2 * EARTH_RADIUS_MILES * np.arcsin(np.minimum(half_chord, 1.0))).astype(lats.dtype, copy=False)
+
+    def _nearest_neighbor(distance_matrix: np.ndarray, start: int) -> np.ndarray:
+        """Greedy tour that always moves to the closest unvisited stop"""
+        n = distance_matrix.shape[0]
+        tour = np.empty(n, dtype=np.int64)
+        visited = np.zeros(n, dtype=bool)
+        tour[0] = start
+        visited[start] = True
+        for k in range(1, n):
+            row = np.where(visited, np.inf, distance_matrix[tour[k - 1]])
+            tour[k] = np.argmin(row)
+            visited[tour[k]] = True
+        return tour
+
+@_jit
+def two_opt(tour: np.ndarray, distance_matrix: np.ndarray, max_passes: int = TWO_OPT_MAX_PASSES) -> np.ndarray:
+    """Improve an open tour in place by reversing segments while that shortens it"""
+    n = len(tour)
+    for _ in range(max_passes):
+        improved = False
+        for i in range(1, n - 1):
+            for j in range(i + 1, n):
+                # Accumulate in float64 so float32 matrices can't make a swap look like a gain
+                prev, first, last = tour[i - 1], tour[i], tour[j]
+                delta = float(distance_matrix[prev, last]) - float(distance_matrix[prev, first])
+                if j + 1 < n:
+                    nxt = tour[j + 1]
+                    delta += float(distance_matrix[first, nxt]) - float(distance_matrix[last, nxt])
+                # Tolerance keeps float noise from swapping equal-length segments back and forth
+                if delta < -1e-8:
+                    lo, hi = i, j
+                    while lo < hi:
+                        tour[lo], tour[hi] = tour[hi], tour[lo]
+                        lo += 1
+                        hi -= 1
+                    improved = True
+        if not improved:
+            break
+    return tour
+
+def distance_matrix(coords: np.ndarray) -> np.ndarray:
+    """Pairwise great-circle distances in miles for an (N, 2) array of lat/lng degrees"""
+    coords = np.asarray(coords)
+    return _haversine_matrix(np.ascontiguousarray(coords[:, 0]), np.ascontiguousarray(coords[:, 1]))
+
+@lru_cache(maxsize=256)
+def cached_distance_matrix(coords_key: Tuple[Tuple[float, float], ...]) -> np.ndarray:
+    """Memoized float32 distance matrix for a tuple of (lat, lng) pairs; read-only since it is shared"""
+    matrix = distance_matrix(np.array(coords_key, dtype=np.float32).reshape(-1, 2))  # () -> (0, 2)
+    matrix.setflags(write=False)
+    return matrix
+
+def nearest_neighbor_tour(distances: np.ndarray, start: int = 0) -> np.ndarray:
+    """Visiting order over a distance matrix, greedily taking the closest unvisited stop from start"""
+    return _nearest_neighbor(distances, start)
+
+def segment_tour(distances: np.ndarray, stops: np.ndarray) -> np.ndarray:
+    """Order a subset of stops nearest-first from stops[0], which stays first, refined by 2-opt"""
+    if len(stops) < 3:
+        return stops.copy()
+    sub = distances[np.ix_(stops, stops)]
+    return stops[two_opt(nearest_neighbor_tour(sub), sub)]
+
+def tour_length(distances: np.ndarray, tour: np.ndarray) -> float:
+    """Total length of an open tour, accumulated in float64"""
+    return float(distances[tour[:-1], tour[1:]].sum(dtype=np.float64))
+
+if njit is not None:
+    # Warm up the JIT so the first real request doesn't pay the compile stall
+    _warmup_matrix = cached_distance_matrix(((0.0, 0.0), (0.0, 0.0)))
+    two_opt(nearest_neighbor_tour(_warmup_matrix), _warmup_matrix)
+    segment_tour(_warmup_matrix, np.array([0, 1, 1], dtype=np.int64))
+    del _warmup_matrix
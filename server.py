@@ -1,12 +1,17 @@
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Set
 import asyncio
-import json
+import orjson
 import logging
+import os
+import random
+import sys
+import time
 from datetime import datetime
+from operator import attrgetter, itemgetter
 import uvicorn
 
 from crew import WalmartSupplyChainCrew
@@ -19,7 +24,8 @@ logger = logging.getLogger(__name__)
 app = FastAPI(
     title="Walmart Supply Chain AI API",
     description="Multi-Agent Supply Chain Optimization System",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 app.add_middleware(
@@ -32,6 +38,10 @@ app.add_middleware(
 
 supply_chain_system = None
 
+UPDATE_BATCH_LIMIT = 64  # max queued state changes folded into one broadcast
+UPDATE_DEBOUNCE_SECONDS = 0.05  # window for coalescing bursts of state changes
+SIMULATION_INTERVAL = 30  # seconds between simulated truck movements
+
 class RouteOptimizationRequest(BaseModel):
     origin_warehouse_id: int
     destination_requests: List[Dict[str, Any]]
@@ -53,29 +63,94 @@ class TruckDispatchRequest(BaseModel):
     route_id: str
     priority: str = "medium"
 
+# Fields served by /api/warehouses and /api/trucks, fetched per object in one attrgetter call
+WAREHOUSE_FIELDS = ("id", "name", "lat", "lng", "type", "inventory", "capacity")
+TRUCK_FIELDS = ("id", "driver", "capacity", "current_load", "lat", "lng", "status", "efficiency",
+                "fuel_saved", "co2_reduced", "completed_stops", "total_stops", "route")
+_warehouse_fields = attrgetter(*WAREHOUSE_FIELDS)
+_truck_fields = attrgetter(*TRUCK_FIELDS)
+
+class _TTLCache:
+    """Briefly memoizes snapshots; concurrent callers for a key share one in-flight computation"""
+    
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self.version = 0
+        self._entries: Dict[str, tuple] = {}  # key -> (expires_at, version, value)
+        self._locks: Dict[str, asyncio.Lock] = {}
+    
+    def invalidate(self):
+        """Make every cached entry stale; call after mutating system state"""
+        self.version += 1
+    
+    def _fresh(self, key: str):
+        entry = self._entries.get(key)
+        if entry and entry[0] > time.monotonic() and entry[1] == self.version:
+            return entry
+        return None
+    
+    async def get(self, key: str, producer):
+        """Return the cached value for key, or await producer() once for all waiting callers"""
+        entry = self._fresh(key)
+        if entry:
+            return entry[2]
+        async with self._locks.setdefault(key, asyncio.Lock()):
+            # Whoever held the lock before us may have just refreshed the entry
+            entry = self._fresh(key)
+            if entry:
+                return entry[2]
+            version = self.version
+            value = await producer()
+            self._entries[key] = (time.monotonic() + self.ttl, version, value)
+            return value
+
+# Status/metrics are polled far more often than they change meaningfully
+snapshot_cache = _TTLCache(ttl=0.5)
+
+async def _status_snapshot() -> Dict[str, Any]:
+    # Built on the loop thread, where every mutation also happens, so the crew's list
+    # caches can't be refilled from a stale read; it's O(1) plus cached lists anyway
+    return supply_chain_system.get_real_time_status()
+
+async def cached_status() -> Dict[str, Any]:
+    """Real-time status snapshot, shared by every caller within the cache TTL"""
+    return await snapshot_cache.get("status", _status_snapshot)
+
 class ConnectionManager:
     def __init__(self):
-        self.active_connections: List[WebSocket] = []
+        self.active_connections: Set[WebSocket] = set()
 
     async def connect(self, websocket: WebSocket):
         await websocket.accept()
-        self.active_connections.append(websocket)
+        self.active_connections.add(websocket)
         logger.info(f"Client connected. Total connections: {len(self.active_connections)}")
 
     def disconnect(self, websocket: WebSocket):
-        self.active_connections.remove(websocket)
+        self.active_connections.discard(websocket)
         logger.info(f"Client disconnected. Total connections: {len(self.active_connections)}")
 
     async def send_personal_message(self, message: str, websocket: WebSocket):
         await websocket.send_text(message)
 
-    async def broadcast(self, message: str):
-        for connection in self.active_connections:
-            try:
-                await connection.send_text(message)
-            except:
-                # Remove broken connections
-                self.active_connections.remove(connection)
+    @staticmethod
+    async def _send(connection: WebSocket, message: bytes) -> Optional[WebSocket]:
+        try:
+            await connection.send_bytes(message)
+        except Exception:
+            return connection  # Broken connection, dropped by the caller
+        return None
+
+    async def _fan_out(self, message: bytes):
+        # Send to all clients concurrently so one slow socket doesn't delay the rest
+        results = await asyncio.gather(
+            *(self._send(connection, message) for connection in list(self.active_connections))
+        )
+        for dead in filter(None, results):
+            self.active_connections.discard(dead)
+
+    async def broadcast_bytes(self, data: bytes):
+        """Send encoded JSON to every client as a binary frame, sharing one buffer across sends"""
+        await self._fan_out(data)
 
 manager = ConnectionManager()
 
@@ -109,8 +184,8 @@ async def get_system_status():
         if not supply_chain_system:
             raise HTTPException(status_code=503, detail="System not initialized")
         
-        status = supply_chain_system.get_real_time_status()
-        return JSONResponse(content=status)
+        status = await cached_status()
+        return ORJSONResponse(content=status)
     except Exception as e:
         logger.error(f"Error getting system status: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -123,21 +198,13 @@ async def get_warehouses():
         if not supply_chain_system:
             raise HTTPException(status_code=503, detail="System not initialized")
         
-        warehouses = [
-            {
-                "id": w.id,
-                "name": w.name,
-                "lat": w.lat,
-                "lng": w.lng,
-                "type": w.type,
-                "inventory": w.inventory,
-                "capacity": w.capacity,
-                "utilization": sum(w.inventory.values()) / w.capacity * 100
-            }
-            for w in supply_chain_system.warehouses
-        ]
+        warehouses = []
+        for w in supply_chain_system.warehouses:
+            warehouse = dict(zip(WAREHOUSE_FIELDS, _warehouse_fields(w)))
+            warehouse["utilization"] = sum(w.inventory.values()) / w.capacity * 100
+            warehouses.append(warehouse)
         
-        return JSONResponse(content={"warehouses": warehouses})
+        return ORJSONResponse(content={"warehouses": warehouses})
     except Exception as e:
         logger.error(f"Error getting warehouses: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -150,26 +217,9 @@ async def get_trucks():
         if not supply_chain_system:
             raise HTTPException(status_code=503, detail="System not initialized")
         
-        trucks = [
-            {
-                "id": t.id,
-                "driver": t.driver,
-                "capacity": t.capacity,
-                "current_load": t.current_load,
-                "lat": t.lat,
-                "lng": t.lng,
-                "status": t.status,
-                "efficiency": t.efficiency,
-                "fuel_saved": t.fuel_saved,
-                "co2_reduced": t.co2_reduced,
-                "completed_stops": t.completed_stops,
-                "total_stops": t.total_stops,
-                "route": t.route
-            }
-            for t in supply_chain_system.trucks
-        ]
+        trucks = [dict(zip(TRUCK_FIELDS, _truck_fields(t))) for t in supply_chain_system.trucks]
         
-        return JSONResponse(content={"trucks": trucks})
+        return ORJSONResponse(content={"trucks": trucks})
     except Exception as e:
         logger.error(f"Error getting trucks: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -182,23 +232,24 @@ async def analyze_supply_chain():
         if not supply_chain_system:
             raise HTTPException(status_code=503, detail="System not initialized")
         
+        timestamp = datetime.now().isoformat()
         # Broadcast analysis start
-        await manager.broadcast(json.dumps({
+        await manager.broadcast_bytes(orjson.dumps({
             "type": "analysis_started",
             "message": "AI agents are analyzing supply chain...",
-            "timestamp": datetime.now().isoformat()
+            "timestamp": timestamp
         }))
         
-        analysis = supply_chain_system.analyze_supply_chain_status()
+        analysis = await supply_chain_system.analyze_supply_chain_status()
         
         # Broadcast analysis complete
-        await manager.broadcast(json.dumps({
+        await manager.broadcast_bytes(orjson.dumps({
             "type": "analysis_complete",
             "data": analysis,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": timestamp
         }))
         
-        return JSONResponse(content=analysis)
+        return ORJSONResponse(content=analysis)
     except Exception as e:
         logger.error(f"Error in supply chain analysis: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -211,26 +262,29 @@ async def optimize_route(request: RouteOptimizationRequest):
         if not supply_chain_system:
             raise HTTPException(status_code=503, detail="System not initialized")
         
+        timestamp = datetime.now().isoformat()
         # Broadcast optimization start
-        await manager.broadcast(json.dumps({
+        await manager.broadcast_bytes(orjson.dumps({
             "type": "route_optimization_started",
             "message": f"Optimizing route from warehouse {request.origin_warehouse_id}...",
-            "timestamp": datetime.now().isoformat()
+            "timestamp": timestamp
         }))
         
-        result = supply_chain_system.optimize_route(
+        result = await supply_chain_system.optimize_route(
             request.origin_warehouse_id,
             request.destination_requests
         )
+        snapshot_cache.invalidate()
+        await supply_chain_system.update_queue.put({"type": "route", "origin_warehouse_id": request.origin_warehouse_id})
         
         # Broadcast optimization complete
-        await manager.broadcast(json.dumps({
+        await manager.broadcast_bytes(orjson.dumps({
             "type": "route_optimization_complete",
             "data": result,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": timestamp
         }))
         
-        return JSONResponse(content=result)
+        return ORJSONResponse(content=result)
     except Exception as e:
         logger.error(f"Error in route optimization: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -243,26 +297,27 @@ async def forecast_demand(request: DemandForecastRequest):
         if not supply_chain_system:
             raise HTTPException(status_code=503, detail="System not initialized")
         
+        timestamp = datetime.now().isoformat()
         # Broadcast forecasting start
-        await manager.broadcast(json.dumps({
+        await manager.broadcast_bytes(orjson.dumps({
             "type": "demand_forecast_started",
             "message": f"Forecasting demand for {request.region}...",
-            "timestamp": datetime.now().isoformat()
+            "timestamp": timestamp
         }))
         
-        result = supply_chain_system.forecast_demand(
+        result = await supply_chain_system.forecast_demand(
             request.region,
             request.days_ahead
         )
         
         # Broadcast forecasting complete
-        await manager.broadcast(json.dumps({
+        await manager.broadcast_bytes(orjson.dumps({
             "type": "demand_forecast_complete",
             "data": result,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": timestamp
         }))
         
-        return JSONResponse(content=result)
+        return ORJSONResponse(content=result)
     except Exception as e:
         logger.error(f"Error in demand forecasting: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -275,28 +330,31 @@ async def emergency_restock(request: EmergencyRestockRequest):
         if not supply_chain_system:
             raise HTTPException(status_code=503, detail="System not initialized")
         
+        timestamp = datetime.now().isoformat()
         # Broadcast emergency alert
-        await manager.broadcast(json.dumps({
+        await manager.broadcast_bytes(orjson.dumps({
             "type": "emergency_alert",
             "message": f"Emergency restock initiated for warehouse {request.warehouse_id}",
             "urgency": request.urgency,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": timestamp
         }))
         
-        result = supply_chain_system.handle_emergency_restock(
+        result = await supply_chain_system.handle_emergency_restock(
             request.warehouse_id,
             request.product,
             request.critical_level
         )
+        snapshot_cache.invalidate()
+        await supply_chain_system.update_queue.put({"type": "restock", "warehouse_id": request.warehouse_id})
         
         # Broadcast emergency response
-        await manager.broadcast(json.dumps({
+        await manager.broadcast_bytes(orjson.dumps({
             "type": "emergency_response",
             "data": result,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": timestamp
         }))
         
-        return JSONResponse(content=result)
+        return ORJSONResponse(content=result)
     except Exception as e:
         logger.error(f"Error in emergency restock: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -309,8 +367,9 @@ async def dispatch_truck(request: TruckDispatchRequest):
         if not supply_chain_system:
             raise HTTPException(status_code=503, detail="System not initialized")
         
+        timestamp = datetime.now().isoformat()
         # Find the truck
-        truck = next((t for t in supply_chain_system.trucks if t.id == request.truck_id), None)
+        truck = supply_chain_system._truck_by_id.get(request.truck_id)
         if not truck:
             raise HTTPException(status_code=404, detail="Truck not found")
         
@@ -318,10 +377,12 @@ async def dispatch_truck(request: TruckDispatchRequest):
             raise HTTPException(status_code=400, detail="Truck is not available")
         
         # Update truck status
-        truck.status = 'en-route'
+        supply_chain_system.set_truck_status(truck, 'en-route')
+        snapshot_cache.invalidate()
+        await supply_chain_system.update_queue.put({"type": "truck", "id": truck.id, "status": truck.status})
         
         # Broadcast truck dispatch
-        await manager.broadcast(json.dumps({
+        await manager.broadcast_bytes(orjson.dumps({
             "type": "truck_dispatched",
             "data": {
                 "truck_id": request.truck_id,
@@ -329,10 +390,10 @@ async def dispatch_truck(request: TruckDispatchRequest):
                 "priority": request.priority,
                 "driver": truck.driver
             },
-            "timestamp": datetime.now().isoformat()
+            "timestamp": timestamp
         }))
         
-        return JSONResponse(content={
+        return ORJSONResponse(content={
             "success": True,
             "message": f"Truck {request.truck_id} dispatched successfully",
             "truck_id": request.truck_id,
@@ -342,6 +403,22 @@ async def dispatch_truck(request: TruckDispatchRequest):
         logger.error(f"Error dispatching truck: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+# Compact pings as clients send them, and the fixed part of the pong reply
+_PING_PREFIXES = ('{"type":"ping"}', '{"type":"ping",')
+_PONG_PREFIX = b'{"type":"pong","timestamp":"'
+
+def _pong_frame() -> bytes:
+    """Pong reply built from the precomputed prefix instead of encoding a dict per ping"""
+    return _PONG_PREFIX + datetime.now().isoformat().encode() + b'"}'
+
+def _status_frame(status: Dict[str, Any]) -> bytes:
+    """System status message, sent binary like every other server-to-client frame"""
+    return orjson.dumps({
+        "type": "system_status",
+        "data": status,
+        "timestamp": datetime.now().isoformat()
+    })
+
 # WebSocket endpoint for real-time updates
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
@@ -349,31 +426,30 @@ async def websocket_endpoint(websocket: WebSocket):
     try:
         # Send initial system status
         if supply_chain_system:
-            status = supply_chain_system.get_real_time_status()
-            await websocket.send_text(json.dumps({
-                "type": "system_status",
-                "data": status,
-                "timestamp": datetime.now().isoformat()
-            }))
+            status = await cached_status()
+            await websocket.send_bytes(_status_frame(status))
         
         while True:
             # Keep connection alive and listen for client messages
-            data = await websocket.receive_text()
-            message = json.loads(data)
+            frame = await websocket.receive()
+            if frame["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(frame.get("code", 1000))
+            data = frame.get("text")
+            if data is None:
+                data = (frame.get("bytes") or b"").decode()
+            
+            # Pings are the bulk of client traffic; answer them without parsing JSON
+            if data.startswith(_PING_PREFIXES):
+                await websocket.send_bytes(_pong_frame())
+                continue
+            message = orjson.loads(data)
             
             if message.get("type") == "ping":
-                await websocket.send_text(json.dumps({
-                    "type": "pong",
-                    "timestamp": datetime.now().isoformat()
-                }))
+                await websocket.send_bytes(_pong_frame())
             elif message.get("type") == "request_status":
                 if supply_chain_system:
-                    status = supply_chain_system.get_real_time_status()
-                    await websocket.send_text(json.dumps({
-                        "type": "system_status",
-                        "data": status,
-                        "timestamp": datetime.now().isoformat()
-                    }))
+                    status = await cached_status()
+                    await websocket.send_bytes(_status_frame(status))
                     
     except WebSocketDisconnect:
         manager.disconnect(websocket)
@@ -381,6 +457,27 @@ async def websocket_endpoint(websocket: WebSocket):
         logger.error(f"WebSocket error: {str(e)}")
         manager.disconnect(websocket)
 
+def compute_performance_metrics() -> Dict[str, Any]:
+    """Aggregate dashboard metrics from current fleet and warehouse state"""
+    # Running totals are maintained by the system's mutation helpers
+    agg = supply_chain_system._agg
+    truck_count = len(supply_chain_system.trucks)
+    
+    return {
+        "total_distance": supply_chain_system.performance_metrics.get("total_distance_saved", 0),
+        "fuel_saved": agg["total_fuel_saved"],
+        "co2_reduced": agg["total_co2_reduced"],
+        "efficiency": round(agg["efficiency_sum"] / truck_count, 1),
+        "active_routes": agg["active_trucks"],
+        "total_inventory": agg["total_inventory"],
+        "warehouse_utilization": round((agg["total_inventory"] / agg["total_capacity"]) * 100, 1),
+        "fleet_utilization": round((agg["active_trucks"] / truck_count) * 100, 1),
+        "timestamp": datetime.now().isoformat()
+    }
+
+async def _metrics_snapshot() -> Dict[str, Any]:
+    return compute_performance_metrics()
+
 # Performance metrics endpoint
 @app.get("/api/metrics")
 async def get_performance_metrics():
@@ -389,80 +486,93 @@ async def get_performance_metrics():
         if not supply_chain_system:
             raise HTTPException(status_code=503, detail="System not initialized")
         
-        # Calculate real-time metrics
-        total_inventory = sum(sum(w.inventory.values()) for w in supply_chain_system.warehouses)
-        active_trucks = len([t for t in supply_chain_system.trucks if t.status != 'idle'])
-        total_fuel_saved = sum(t.fuel_saved for t in supply_chain_system.trucks)
-        total_co2_reduced = sum(t.co2_reduced for t in supply_chain_system.trucks)
-        avg_efficiency = sum(t.efficiency for t in supply_chain_system.trucks) / len(supply_chain_system.trucks)
-        
-        metrics = {
-            "total_distance": supply_chain_system.performance_metrics.get("total_distance_saved", 0),
-            "fuel_saved": total_fuel_saved,
-            "co2_reduced": total_co2_reduced,
-            "efficiency": round(avg_efficiency, 1),
-            "active_routes": active_trucks,
-            "total_inventory": total_inventory,
-            "warehouse_utilization": round((total_inventory / sum(w.capacity for w in supply_chain_system.warehouses)) * 100, 1),
-            "fleet_utilization": round((active_trucks / len(supply_chain_system.trucks)) * 100, 1),
-            "timestamp": datetime.now().isoformat()
-        }
+        metrics = await snapshot_cache.get("metrics", _metrics_snapshot)
+        metrics = {**metrics, **supply_chain_system.get_llm_load()}
         
-        return JSONResponse(content=metrics)
+        return ORJSONResponse(content=metrics)
     except Exception as e:
         logger.error(f"Error getting metrics: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 # Background task to simulate real-time updates
-async def simulate_real_time_updates():
-    """Simulate real-time system updates"""
+# Per-truck views reused across ticks so each update only rewrites fields
+_truck_view_cache: Dict[str, Dict[str, Any]] = {}
+
+def refresh_truck_views() -> List[Dict[str, Any]]:
+    """Update the cached per-truck broadcast views in place"""
+    views = []
+    for t in supply_chain_system.trucks:
+        view = _truck_view_cache.get(t.id)
+        if view is None:
+            view = _truck_view_cache[t.id] = {"id": t.id}
+        view["lat"] = t.lat
+        view["lng"] = t.lng
+        view["status"] = t.status
+        view["fuel_saved"] = t.fuel_saved
+        view["co2_reduced"] = t.co2_reduced
+        views.append(view)
+    return views
+
+async def broadcast_state_updates():
+    """Push a real-time update to clients whenever a state change is queued"""
     while True:
         try:
-            if supply_chain_system and len(manager.active_connections) > 0:
-                # Simulate some changes
-                import random
-                
+            if not supply_chain_system:
+                await asyncio.sleep(5)
+                continue
+            queue = supply_chain_system.update_queue
+            events = [await queue.get()]
+            # Let a burst of changes land, then fold them into one frame
+            await asyncio.sleep(UPDATE_DEBOUNCE_SECONDS)
+            while len(events) < UPDATE_BATCH_LIMIT and not queue.empty():
+                events.append(queue.get_nowait())
+            events.sort(key=itemgetter("type"))  # stable, so each type keeps its arrival order
+            
+            if manager.active_connections:
+                # Serialized once per batch for every client
+                payload = orjson.dumps({
+                    "type": "batch",
+                    "events": events,
+                    "data": {
+                        "trucks": refresh_truck_views(),
+                        "performance_metrics": supply_chain_system.performance_metrics
+                    },
+                    "timestamp": datetime.now().isoformat()
+                })
+                await manager.broadcast_bytes(payload)
+        except Exception as e:
+            logger.error(f"Error in real-time updates: {str(e)}")
+            await asyncio.sleep(1)
+
+async def simulate_truck_movement():
+    """Drift en-route trucks while clients are watching, queueing an update each step"""
+    while True:
+        await asyncio.sleep(SIMULATION_INTERVAL)
+        try:
+            if supply_chain_system and manager.active_connections:
                 # Update some truck positions slightly
                 for truck in supply_chain_system.trucks:
                     if truck.status == 'en-route':
                         truck.lat += random.uniform(-0.001, 0.001)
                         truck.lng += random.uniform(-0.001, 0.001)
-                        truck.fuel_saved += random.uniform(0, 0.1)
-                        truck.co2_reduced += random.uniform(0, 0.3)
+                        supply_chain_system.apply_fuel_saved(truck, random.uniform(0, 0.1))
+                        supply_chain_system.apply_co2_reduced(truck, random.uniform(0, 0.3))
+                supply_chain_system.invalidate_cache(warehouses=False)
+                snapshot_cache.invalidate()
                 
                 # Update performance metrics
                 supply_chain_system.performance_metrics["efficiency_score"] = min(99, 
                     supply_chain_system.performance_metrics["efficiency_score"] + random.uniform(-0.5, 0.5))
                 
-                # Broadcast updates
-                await manager.broadcast(json.dumps({
-                    "type": "real_time_update",
-                    "data": {
-                        "trucks": [
-                            {
-                                "id": t.id,
-                                "lat": t.lat,
-                                "lng": t.lng,
-                                "status": t.status,
-                                "fuel_saved": t.fuel_saved,
-                                "co2_reduced": t.co2_reduced
-                            }
-                            for t in supply_chain_system.trucks
-                        ],
-                        "performance_metrics": supply_chain_system.performance_metrics
-                    },
-                    "timestamp": datetime.now().isoformat()
-                }))
-            
-            await asyncio.sleep(5)  # Update every 5 seconds
+                await supply_chain_system.update_queue.put({"type": "movement"})
         except Exception as e:
-            logger.error(f"Error in real-time updates: {str(e)}")
-            await asyncio.sleep(10)
+            logger.error(f"Error in truck movement simulation: {str(e)}")
 
-# Start background task
+# Start background tasks
 @app.on_event("startup")
 async def start_background_tasks():
-    asyncio.create_task(simulate_real_time_updates())
+    asyncio.create_task(broadcast_state_updates())
+    asyncio.create_task(simulate_truck_movement())
 
 if __name__ == "__main__":
     print("🚀 Starting Walmart Supply Chain AI Server...")
@@ -470,10 +580,15 @@ if __name__ == "__main__":
     print("📊 API documentation: http://localhost:8000/docs")
     print("🔌 WebSocket endpoint: ws://localhost:8000/ws")
     
+    # uvloop/httptools for event-loop and HTTP parsing throughput (uvloop has no Windows build).
+    # System state and websocket clients live in-process, so keep one worker unless that's acceptable.
     uvicorn.run(
         "server:app",
         host="0.0.0.0",
         port=8000,
-        reload=True,
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
+        reload=os.getenv("DEV") == "1",
+        workers=int(os.getenv("WEB_WORKERS", "1")),
         log_level="info"
     )
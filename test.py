@@ -1,19 +1,28 @@
-from openai import OpenAI
+import asyncio
 
-client = OpenAI()
 
-response = client.chat.completions.create(
+async def main():
+    # Imported here so test collectors can import this module without touching the SDK or the network
+    from crew import get_openai_client
 
-    model="gpt-4o-mini-2024-07-18",
+    client = get_openai_client()
 
-    messages=[
+    response = await client.chat.completions.create(
 
-    {"role": "system", "content": "You are a fitness coach. Provide personalized workout advice."},
+        model="gpt-4o-mini-2024-07-18",
 
-    {"role": "user", "content": "I want to build muscle but I only have 30 minutes a day to workout. What should I focus on?"}
+        messages=[
 
-    ]
+        {"role": "system", "content": "You are a fitness coach. Provide personalized workout advice."},
 
-)
+        {"role": "user", "content": "I want to build muscle but I only have 30 minutes a day to workout. What should I focus on?"}
 
-print(response.choices[0].message.content)
+        ]
+
+    )
+
+    print(response.choices[0].message.content)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())